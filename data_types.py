@@ -12,17 +12,20 @@ class DataType:
         self.name = name
         self.size = size
         self.struct_code = struct_code
+        self.typecode = struct_code[1:]  # array.array typecode used to store scan result values (same letter as the struct format)
         self.min_val = min_val
         self.max_val = max_val
         self.is_signed = is_signed
+        self._struct = struct.Struct(struct_code)  # Compiled once so the format is not re-parsed per call
+        self._coerce = float if struct_code in ('<f', '<d') else int  # Chosen once so pack() never branches on type
     
     def pack(self, value):
-        """Pack a value into bytes."""
-        return struct.pack(self.struct_code, value)
+        """Pack a value into bytes, converting it to this type's int or float first."""
+        return self._struct.pack(self._coerce(value))
     
     def unpack(self, data: bytes):
         """Unpack bytes into a value."""
-        return struct.unpack(self.struct_code, data)[0]
+        return self._struct.unpack(data)[0]
 
 
 # Define available data types
@@ -10,6 +10,8 @@ from ui import (
     display_main_menu,
     choose_data_type,
     get_scan_value,
+    confirm_zero_scan,
+    choose_scan_alignment,
     display_scan_results,
     display_addresses,
     select_address_to_edit,
@@ -17,10 +19,22 @@ from ui import (
 )
 from data_types import DataType, INT32
 from rich.console import Console
+import struct
 
 console = Console()
 
 
+def is_zero_bytes(value, data_type: DataType) -> bool:
+    """
+    Check whether a value packs to all-zero bytes (the scanner's zero fast path; -0.0 does not).
+    Returns False if the value does not fit the type, so scan() reports it instead.
+    """
+    try:
+        return not any(data_type.pack(value))
+    except (struct.error, OverflowError):
+        return False
+
+
 def main():
     """Main application entry point."""
     # Display welcome
@@ -80,8 +94,13 @@ def main():
             if menu_choice == '1':  # New scan
                 value = get_scan_value(data_type)
                 if value is not None:
+                    if is_zero_bytes(value, data_type) and not confirm_zero_scan():
+                        continue
+                    aligned = choose_scan_alignment(data_type)
+                    if aligned is None:
+                        continue
                     console.print(f"\n[cyan]Scanning for value: {value}[/cyan]")
-                    count = scanner.scan(value)
+                    count = scanner.scan(value, aligned=aligned)
                     display_scan_results(count, data_type)
                     scanning_started = True
             
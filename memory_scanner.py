@@ -3,29 +3,120 @@ Core memory scanning functionality.
 Handles reading memory regions, scanning for values, and writing to memory.
 """
 
+import ctypes
+import os
+import threading
+import time
 import pymem
-import struct
-from typing import List, Tuple, Optional, Any
+from array import array
+from collections import deque
+from collections.abc import Sequence as SequenceABC
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Optional, Any, Sequence, Callable
 from data_types import DataType
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
 
 console = Console()
 
+# Memory state and protection flags (winnt.h)
+MEM_COMMIT = 0x1000
+PAGE_GUARD = 0x100
+# PAGE_READONLY | PAGE_READWRITE | PAGE_WRITECOPY | PAGE_EXECUTE_READ | PAGE_EXECUTE_READWRITE | PAGE_EXECUTE_WRITECOPY
+PAGE_READABLE = 0x02 | 0x04 | 0x08 | 0x20 | 0x40 | 0x80
+
+
+class _SystemInfo(ctypes.Structure):
+    """SYSTEM_INFO structure filled in by GetSystemInfo."""
+    _fields_ = [
+        ("wProcessorArchitecture", ctypes.c_ushort),
+        ("wReserved", ctypes.c_ushort),
+        ("dwPageSize", ctypes.c_ulong),
+        ("lpMinimumApplicationAddress", ctypes.c_void_p),
+        ("lpMaximumApplicationAddress", ctypes.c_void_p),
+        ("dwActiveProcessorMask", ctypes.c_void_p),
+        ("dwNumberOfProcessors", ctypes.c_ulong),
+        ("dwProcessorType", ctypes.c_ulong),
+        ("dwAllocationGranularity", ctypes.c_ulong),
+        ("wProcessorLevel", ctypes.c_ushort),
+        ("wProcessorRevision", ctypes.c_ushort),
+    ]
+
+
+def _get_max_application_address() -> int:
+    """Get the highest user-mode address, falling back to the 64-bit Windows limit."""
+    try:
+        info = _SystemInfo()
+        ctypes.windll.kernel32.GetSystemInfo(ctypes.byref(info))
+        return info.lpMaximumApplicationAddress
+    except Exception:
+        return 0x7FFFFFFEFFFF
+
+
+def _bounded_map(executor: ThreadPoolExecutor, fn: Callable, items: Sequence, window: int):
+    """
+    Like executor.map, but keep at most window calls queued or running at once.
+    Yields (item, result) pairs in item order. On early exit (e.g. Ctrl+C) the
+    queued calls are cancelled instead of being run to completion.
+    """
+    pending = deque()
+    try:
+        for item in items:
+            pending.append((item, executor.submit(fn, item)))
+            if len(pending) >= window:
+                done_item, future = pending.popleft()
+                yield done_item, future.result()
+        while pending:
+            done_item, future = pending.popleft()
+            yield done_item, future.result()
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+class ScanResults(SequenceABC):
+    """Read-only (address, value) view over the scanner's result arrays, built on demand."""
+    
+    __slots__ = ('_addrs', '_values')
+    
+    def __init__(self, addrs: array, values: array):
+        self._addrs = addrs
+        self._values = values
+    
+    def __len__(self) -> int:
+        return len(self._addrs)
+    
+    def __getitem__(self, index):
+        # Only the requested page of results is turned into tuples
+        if isinstance(index, slice):
+            return list(zip(self._addrs[index], self._values[index]))
+        return (self._addrs[index], self._values[index])
+
 
 class MemoryScanner:
     """Handles memory scanning and editing operations."""
     
+    # Fixed attribute set: a misspelled attribute assignment raises instead of silently adding state
+    __slots__ = ('process_name', 'pid', 'pm', 'data_type', '_addrs', '_values', 'cached_regions', '_regions_time')
+    
+    # Seconds a discovered region list is reused before the address space is walked again
+    REGION_CACHE_TTL = 10.0
+    
     def __init__(self, process_name: str, pid: int):
         self.process_name = process_name
         self.pid = pid
         self.pm = None
-        self.current_results: List[Tuple[int, Any]] = []  # List of (address, value) tuples
         self.data_type: Optional[DataType] = None
+        # Results are stored as parallel arrays (addresses, values) rather than a list of tuples.
+        # Addresses are kept in ascending order so filter_scan can group them without sorting.
+        self._addrs = array('Q')
+        self._values = array('i')
         self.cached_regions: Optional[List[Tuple[int, int]]] = None  # Cache regions to avoid re-scanning
+        self._regions_time = 0.0  # time.monotonic() when cached_regions was discovered
         
     def attach(self) -> bool:
         """Attach to the process."""
+        self.cached_regions = None
         try:
             self.pm = pymem.Pymem(process_name=self.process_name)
             return True
@@ -41,10 +132,17 @@ class MemoryScanner:
             except:
                 pass
             self.pm = None
+        self.cached_regions = None
     
     def set_data_type(self, data_type: DataType):
         """Set the data type for scanning."""
         self.data_type = data_type
+        self._clear_results()
+    
+    def _clear_results(self):
+        """Drop current results and size the value array for the current data type."""
+        self._addrs = array('Q')
+        self._values = array(self.data_type.typecode if self.data_type else 'i')
     
     def _read_memory_region(self, start_address: int, size: int) -> Optional[bytes]:
         """Read a memory region safely."""
@@ -57,6 +155,21 @@ class MemoryScanner:
             # This is normal - many regions are not readable
             return None
     
+    def _read_into(self, buffer: ctypes.Array, address: int, size: int) -> bool:
+        """
+        Read memory straight into a preallocated ctypes buffer. pymem's read_bytes
+        allocates a new buffer and copies it into a bytes object on every call.
+        Returns: True if the whole range was read
+        """
+        try:
+            bytes_read = ctypes.c_size_t()
+            ok = pymem.ressources.kernel32.ReadProcessMemory(
+                self.pm.process_handle, address, buffer, size, ctypes.byref(bytes_read)
+            )
+            return bool(ok) and bytes_read.value == size
+        except Exception:
+            return False
+    
     def _get_readable_memory_regions(self) -> List[Tuple[int, int]]:
         """Get list of readable memory regions as (start, size) tuples."""
         regions = []
@@ -65,47 +178,124 @@ class MemoryScanner:
         discovered_count = 0
         
         try:
-            # Limit to reasonable 64-bit address space (up to 128GB)
-            max_address = 0x2000000000  # 128 GB, reasonable upper bound
+            # Walk the whole user-mode address space; free ranges come back as one large region
+            max_address = _get_max_application_address()
             
             while address < max_address:
                 try:
                     mbi = self.pm.virtual_query(address)
-                    region_size = mbi.RegionSize
-                    scanned_count += 1
-                    
-                    # Log progress every 100 regions for visibility
-                    if scanned_count % 100 == 0:
-                        console.print(f"[dim]Scanned {scanned_count:,} regions, testing {len(regions):,} @ {hex(address)[:14]}...[/dim]", end="\r")
-                    
-                    # Check if region is committed 
-                    if mbi.State == 0x1000:  # MEM_COMMIT
-                        # Test if we can actually READ this region
-                        try:
-                            # Try to read a small chunk to verify accessibility
-                            test_data = self.pm.read_bytes(address, min(0x1000, region_size))
-                            if test_data:
-                                regions.append((address, region_size))
-                                discovered_count += 1
-                        except:
-                            # Region exists but not readable, skip it
-                            pass
-                    
-                    address += region_size
                 except Exception:
-                    # If virtual_query fails, advance by page size
-                    address += 0x1000  # 4KB page size
+                    # VirtualQueryEx only fails for a valid handle once past the end of the address space
+                    break
+                region_size = mbi.RegionSize
+                if not region_size:
+                    break
+                scanned_count += 1
+                
+                # Log progress every 100 regions for visibility
+                if scanned_count % 100 == 0:
+                    console.print(f"[dim]Scanned {scanned_count:,} regions, testing {len(regions):,} @ {hex(address)[:14]}...[/dim]", end="\r")
+                
+                # Keep committed regions whose protection allows reading (this excludes
+                # PAGE_NOACCESS and guard pages). There is no probe read here: scan()
+                # skips any chunk that still fails to read.
+                if mbi.State == MEM_COMMIT and mbi.Protect & PAGE_READABLE and not mbi.Protect & PAGE_GUARD:
+                    regions.append((address, region_size))
+                    discovered_count += 1
+                
+                # Free and reserved ranges report their full size too, so every step skips a whole region
+                address += region_size
                     
         except Exception as e:
             console.print(f"\n[dim]Region scanning stopped: {e}[/dim]")
         
         # Print final status
-        console.print(f"\n[dim]Scanned {scanned_count:,} total regions, found {discovered_count:,} actually readable[/dim]")
+        console.print(f"\n[dim]Scanned {scanned_count:,} total regions, found {discovered_count:,} readable[/dim]")
         return regions
     
-    def scan(self, target_value: Any) -> int:
+    def _make_chunk_scanner(self, target_bytes: bytes, aligned: bool, buffer_size: int) -> Callable[[int, int], array]:
+        """
+        Build a function that reads one chunk of memory and searches it for target_bytes.
+        The target and alignment mode are bound once per scan, so the search loops
+        do no attribute lookups and never test which mode they are in.
+        Chunks of up to buffer_size bytes are read into one reusable buffer per worker thread.
+        Returns: Function taking (address, size) and returning an array of matching addresses
+        """
+        read_into = self._read_into
+        size_of_type = len(target_bytes)
+        local = threading.local()
+        
+        def read(address: int, size: int) -> Optional[bytearray]:
+            buffers = getattr(local, 'buffers', None)
+            if buffers is None:
+                data = bytearray(buffer_size)
+                buffers = local.buffers = (data, (ctypes.c_char * buffer_size).from_buffer(data))
+            data, c_buffer = buffers
+            return data if read_into(c_buffer, address, size) else None
+        
+        # Search for matching bytes with bytearray.find, which runs in C.
+        # The buffer is reused, so searches stop at size rather than the buffer's end.
+        if aligned:
+            step = size_of_type
+            
+            def search(data: bytearray, address: int, size: int) -> array:
+                hits = array('Q')
+                add_hit = hits.append
+                find = data.find
+                pos = 0
+                while True:
+                    i = find(target_bytes, pos, size)
+                    if i < 0:
+                        break
+                    misalignment = (address + i) % size_of_type
+                    if misalignment == 0:
+                        add_hit(address + i)
+                        pos = i + size_of_type
+                    else:
+                        # Resume at the next aligned address
+                        pos = i + size_of_type - misalignment
+                return hits
+        else:
+            step = 1
+            
+            def search(data: bytearray, address: int, size: int) -> array:
+                hits = array('Q')
+                add_hit = hits.append
+                find = data.find
+                pos = 0
+                while True:
+                    i = find(target_bytes, pos, size)
+                    if i < 0:
+                        break
+                    add_hit(address + i)
+                    # Advance by one byte so overlapping matches are still found
+                    pos = i + 1
+                return hits
+        
+        if any(target_bytes):
+            def scan_chunk(address: int, size: int) -> array:
+                data = read(address, size)
+                return search(data, address, size) if data is not None else array('Q')
+        else:
+            # Zero is by far the most common value in memory and committed-but-untouched
+            # pages are entirely zero. Such a chunk matches at every (aligned) position,
+            # so emit those addresses as a range instead of running find once per hit.
+            def scan_chunk(address: int, size: int) -> array:
+                data = read(address, size)
+                if data is None:
+                    return array('Q')
+                if data.count(0, 0, size) == size:
+                    first = address + (-address) % step
+                    return array('Q', range(first, address + size - size_of_type + 1, step))
+                return search(data, address, size)
+        
+        return scan_chunk
+    
+    def scan(self, target_value: Any, aligned: bool = False) -> int:
         """
         Scan memory for matching values.
+        If aligned is True, only addresses that are a multiple of the data type
+        size are reported (values in game memory are almost always aligned).
         Returns: Number of results found
         """
         if not self.data_type:
@@ -113,20 +303,24 @@ class MemoryScanner:
         
         # Pack the target value into bytes
         try:
-            if isinstance(target_value, float):
-                target_bytes = struct.pack(self.data_type.struct_code, target_value)
-            else:
-                target_bytes = struct.pack(self.data_type.struct_code, int(target_value))
+            target_bytes = self.data_type.pack(target_value)
         except:
             raise ValueError(f"Invalid value for {self.data_type.name}")
+
+        # Every hit matches target_bytes exactly, so unpack once instead of per hit
+        # (for floats this is the rounded value actually stored in memory)
+        found_value = self.data_type.unpack(target_bytes)
+
+        self._clear_results()
+        found_array = array(self.data_type.typecode, [found_value])
         
-        self.current_results.clear()
-        
-        # Use cached regions if available, otherwise discover them
-        if self.cached_regions is None:
+        # Use cached regions if recently discovered; the target keeps allocating
+        # and freeing memory, so an older region list would miss new values
+        if self.cached_regions is None or time.monotonic() - self._regions_time > self.REGION_CACHE_TTL:
             console.print("[cyan]Step 1/2: Discovering readable memory regions...[/cyan]")
             console.print("[dim]This scans the entire address space to find accessible memory regions.[/dim]\n")
             self.cached_regions = self._get_readable_memory_regions()
+            self._regions_time = time.monotonic()
         
         regions = self.cached_regions
         total_size = sum(size for _, size in regions)
@@ -140,47 +334,82 @@ class MemoryScanner:
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            console=console
+            console=console,
+            refresh_per_second=4
         ) as progress:
             task = progress.add_task(
-                f"Region 0/{len(regions)} [{len(self.current_results)} found]", 
+                f"Region 0/{len(regions)} [{len(self._addrs)} found]", 
                 total=total_size
             )
             
-            for region_idx, (start_address, size) in enumerate(regions, 1):
-                # Update every 10 regions to avoid excessive updates
-                if region_idx % 10 == 1:
-                    progress.update(
-                        task, 
-                        description=f"Region {region_idx}/{len(regions)} [{len(self.current_results)} found]"
-                    )
-                
-                # Read in chunks for performance
-                chunk_size = 64 * 1024  # 64KB chunks
-                for offset in range(0, size, chunk_size):
-                    actual_size = min(chunk_size, size - offset)
-                    data = self._read_memory_region(start_address + offset, actual_size)
-                    
-                    if data and len(data) > 0:
-                        # Search for matching bytes
-                        # Only scan if we have enough data for the data type
-                        if len(data) >= self.data_type.size:
-                            for i in range(len(data) - self.data_type.size + 1):
-                                # Compare bytes using direct byte comparison
-                                chunk = data[i:i + self.data_type.size]
-                                if chunk == target_bytes:
-                                    addr = start_address + offset + i
-                                    # Verify by reading the value
-                                    try:
-                                        val = struct.unpack(self.data_type.struct_code, chunk)[0]
-                                        self.current_results.append((addr, val))
-                                    except Exception:
-                                        pass
+            # Read in 1MB chunks: large enough to amortize the per-call cost of
+            # ReadProcessMemory, small enough to bound the buffers held by the workers.
+            # Each read runs size-1 bytes into the next chunk so values straddling a
+            # chunk boundary are still found; no match can start in that tail, so
+            # nothing is reported twice.
+            chunk_size = 1024 * 1024
+            overlap = len(target_bytes) - 1
+            work = [
+                (region_idx, start_address + offset, min(chunk_size + overlap, size - offset), min(chunk_size, size - offset))
+                for region_idx, (start_address, size) in enumerate(regions, 1)
+                for offset in range(0, size, chunk_size)
+            ]
+            
+            # Chunks are independent, so read and search them on a thread pool.
+            # ReadProcessMemory releases the GIL, so workers keep reads in flight while
+            # this thread merges finished chunks. Results come back in submission order,
+            # which keeps them sorted, and only a couple of chunks per worker are queued
+            # at a time so memory stays bounded and Ctrl+C does not wait for the whole scan.
+            scan_chunk = self._make_chunk_scanner(target_bytes, aligned, chunk_size + overlap)
+            workers = os.cpu_count() or 4
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                chunk_hits = _bounded_map(executor, lambda item: scan_chunk(item[1], item[2]), work, workers * 2)
+                addrs_extend = self._addrs.extend
+                values_extend = self._values.extend
+                region_count = len(regions)
+                last_region = 0
+                pending_bytes = 0
+                for (region_idx, _, _, actual_size), hits in chunk_hits:
+                    # Advance progress once per region, and relabel only every 10 regions
+                    if region_idx != last_region:
+                        description = None
+                        if region_idx % 10 == 1:
+                            description = f"Region {region_idx}/{region_count} [{len(self._addrs)} found]"
+                        progress.update(task, advance=pending_bytes, description=description)
+                        pending_bytes = 0
+                        last_region = region_idx
                     
-                    progress.update(task, advance=min(actual_size, size - offset))
+                    if hits:
+                        addrs_extend(hits)
+                        values_extend(found_array * len(hits))
+                    pending_bytes += actual_size
+                
+                progress.update(task, advance=pending_bytes)
         
-        console.print(f"\n[green]Scan complete! Found {len(self.current_results)} addresses[/green]\n")
-        return len(self.current_results)
+        console.print(f"\n[green]Scan complete! Found {len(self._addrs)} addresses[/green]\n")
+        return len(self._addrs)
+    
+    @staticmethod
+    def _group_addresses(addresses: Sequence[int], size: int, max_gap: int = 0x1000, max_length: int = 0x100000):
+        """
+        Group sorted addresses whose values lie within max_gap bytes of each other.
+        Groups are capped at max_length bytes so one failed read only falls back to
+        single reads for a bounded number of addresses.
+        Yields: (base, length, addresses) tuples covering each group
+        """
+        if not addresses:
+            return
+        base = addresses[0]
+        end = base + size
+        start_idx = 0
+        for idx in range(1, len(addresses)):
+            address = addresses[idx]
+            if address - end >= max_gap or address + size - base > max_length:
+                yield base, end - base, addresses[start_idx:idx]
+                base = address
+                start_idx = idx
+            end = max(end, address + size)
+        yield base, end - base, addresses[start_idx:]
     
     def filter_scan(self, new_value: Any) -> int:
         """
@@ -192,31 +421,35 @@ class MemoryScanner:
         
         # Pack the new target value
         try:
-            if isinstance(new_value, float):
-                target_bytes = struct.pack(self.data_type.struct_code, new_value)
-            else:
-                target_bytes = struct.pack(self.data_type.struct_code, int(new_value))
+            target_bytes = self.data_type.pack(new_value)
         except:
             raise ValueError(f"Invalid value for {self.data_type.name}")
         
-        new_results = []
+        # Survivors match target_bytes exactly, so their value is known up front
+        found_value = self.data_type.unpack(target_bytes)
+        size = self.data_type.size
+        read = self._read_memory_region
+        new_addrs = array('Q')
         
-        for address, _ in self.current_results:
-            try:
-                # Re-read the value at this address
-                data = self._read_memory_region(address, self.data_type.size)
-                if data and data == target_bytes:
-                    val = struct.unpack(self.data_type.struct_code, data)[0]
-                    new_results.append((address, val))
-            except:
-                continue
+        # Re-read nearby results with one read per group instead of one per address,
+        # then keep each group's matches in one pass (startswith compares in place)
+        for base, length, group in self._group_addresses(self._addrs, size):
+            buf = read(base, length)
+            if buf is not None:
+                starts_with = buf.startswith
+                new_addrs.extend([address for address in group if starts_with(target_bytes, address - base)])
+            else:
+                # The grouped read failed (e.g. a page was freed), so fall back to single reads
+                new_addrs.extend([address for address in group if read(address, size) == target_bytes])
         
-        self.current_results = new_results
-        return len(self.current_results)
+        new_values = array(self.data_type.typecode, [found_value]) * len(new_addrs)
+        self._addrs = new_addrs
+        self._values = new_values
+        return len(self._addrs)
     
-    def get_results(self) -> List[Tuple[int, Any]]:
-        """Get the current scan results."""
-        return self.current_results
+    def get_results(self) -> ScanResults:
+        """Get the current scan results as a sequence of (address, value) tuples."""
+        return ScanResults(self._addrs, self._values)
     
     def write_value(self, address: int, value: Any) -> bool:
         """
@@ -227,11 +460,7 @@ class MemoryScanner:
             raise ValueError("Data type not set")
         
         try:
-            if isinstance(value, float):
-                packed = struct.pack(self.data_type.struct_code, value)
-            else:
-                packed = struct.pack(self.data_type.struct_code, int(value))
-            
+            packed = self.data_type.pack(value)
             self.pm.write_bytes(address, packed, self.data_type.size)
             return True
         except Exception as e:
@@ -11,44 +11,47 @@ from rich.text import Text
 
 console = Console()
 
+# Common system processes to filter out
+SYSTEM_PROCESSES = frozenset({
+    'System', 'smss.exe', 'csrss.exe', 'wininit.exe', 'winlogon.exe',
+    'services.exe', 'svchost.exe', 'lsass.exe', 'dwm.exe', 'conhost.exe',
+    'Registry', 'MemCompression', 'Secure System',
+    'sihost.exe', 'taskhostw.exe', 'audiodg.exe',
+    'RuntimeBroker.exe', 'SearchIndexer.exe', 'spoolsv.exe'
+})
+
+# Common Windows executables that are typically not user programs (lowercase for case-insensitive comparison)
+WINDOWS_EXECUTABLES = frozenset({
+    'explorer.exe', 'dllhost.exe', 'werfault.exe', 'applicationframehost.exe'
+})
+
 
 def list_processes(show_all: bool = False) -> List[Tuple[int, str, float]]:
     """
     Get a list of running processes with optional filtering.
     Returns: List of (pid, name, memory_mb) tuples
     """
-    # Common system processes to filter out
-    system_processes = {
-        'System', 'smss.exe', 'csrss.exe', 'wininit.exe', 'winlogon.exe',
-        'services.exe', 'svchost.exe', 'lsass.exe', 'dwm.exe', 'conhost.exe',
-        'csrss.exe', 'Registry', 'MemCompression', 'Secure System',
-        'sihost.exe', 'taskhostw.exe', 'svchost.exe', 'audiodg.exe',
-        'RuntimeBroker.exe', 'SearchIndexer.exe', 'spoolsv.exe'
-    }
-    
-    # Common Windows executables that are typically not user programs (lowercase for case-insensitive comparison)
-    windows_executables = {
-        'explorer.exe', 'dllhost.exe', 'werfault.exe', 'applicationframehost.exe'
-    }
-    
     processes = []
-    for proc in psutil.process_iter(['pid', 'name', 'memory_info']):
+    # Only fetch pid and name up front; memory info is queried afterwards,
+    # and only for processes that survive the name filters
+    for proc in psutil.process_iter(['pid', 'name']):
         try:
             pid = proc.info['pid']
             name = proc.info['name']
-            memory_mb = proc.info['memory_info'].rss / 1024 / 1024
             
-            # Filter out very small processes (< 1 MB) and system processes
+            # Skip specific system processes and Windows system executables (case-insensitive check)
             if not show_all:
-                # Skip very small processes or specific system processes
-                if name in system_processes:
+                if name in SYSTEM_PROCESSES:
                     continue
-                if memory_mb < 1.0:  # Skip processes using less than 1MB
-                    continue
-                # Skip Windows system executables (case-insensitive check)
-                if name.lower() in windows_executables:
+                if name.lower() in WINDOWS_EXECUTABLES:
                     continue
             
+            memory_mb = proc.memory_info().rss / 1024 / 1024
+            
+            # Filter out very small processes (< 1 MB)
+            if not show_all and memory_mb < 1.0:
+                continue
+            
             processes.append((pid, name, memory_mb))
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             continue
@@ -84,6 +84,28 @@ def get_scan_value(data_type: DataType) -> Optional[float]:
             return None
 
 
+def confirm_zero_scan() -> bool:
+    """Warn that a first scan for zero matches a large share of memory and ask to continue."""
+    console.print("[yellow]Warning: zero is the most common value in memory; a new scan for 0 can return millions of addresses.[/yellow]")
+    console.print("[dim]Scanning for a non-zero value first and filtering for 0 later is much faster.[/dim]")
+    try:
+        return input("Scan for 0 anyway? (y/n): ").strip().lower() == 'y'
+    except KeyboardInterrupt:
+        return False
+
+
+def choose_scan_alignment(data_type: DataType) -> Optional[bool]:
+    """Ask whether a new scan should only report aligned addresses. Returns None if cancelled."""
+    if data_type.size == 1:
+        return False  # Every address is aligned for single-byte values
+    
+    try:
+        choice = input(f"Only scan {data_type.size}-byte aligned addresses? (faster, fewer false hits) (Y/n): ").strip().lower()
+    except KeyboardInterrupt:
+        return None
+    return choice != 'n'
+
+
 def display_scan_results(count: int, data_type: DataType):
     """Display scan result count."""
     color = "green" if count < 1000 else "yellow" if count < 10000 else "red"